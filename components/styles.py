@@ -7,9 +7,9 @@ Supports both light and dark modes using CSS variables.
 import streamlit as st
 
 
-def apply_global_styles():
-    """Apply global CSS styles that work in both light and dark modes."""
-    st.markdown("""
+# Global stylesheet, built once at import and re-emitted on each run
+# (Streamlit drops any element a rerun does not re-create).
+_GLOBAL_CSS = """
     <style>
     /* CSS Variables for theme-aware colors */
     :root {
@@ -276,7 +276,12 @@ def apply_global_styles():
     .text-muted { opacity: 0.7; }
 
     </style>
-    """, unsafe_allow_html=True)
+    """
+
+
+def apply_global_styles():
+    """Apply global CSS styles that work in both light and dark modes."""
+    st.markdown(_GLOBAL_CSS, unsafe_allow_html=True)
 
 
 def style_profit_loss(value: float) -> str:
@@ -40,6 +40,9 @@ def get_db_connection():
 class DatabaseManager:
     """Manager class for all database operations."""
 
+    # Settings writes made by this process; part of get_settings_version
+    _settings_writes = 0
+
     # ==================== POSITIONS ====================
 
     @staticmethod
@@ -120,6 +123,47 @@ class DatabaseManager:
             ).fetchall()
             return [DatabaseManager._row_to_position(row) for row in rows]
 
+    @staticmethod
+    def get_open_positions_columnar() -> Dict[str, list]:
+        """
+        Get open positions as columns (one list per field), ordered by expiry.
+        Includes a computed 'days_to_expiry' column.
+        """
+        columns = ['underlying', 'option_type', 'strike', 'strategy_type',
+                   'premium_collected', 'quantity', 'days_to_expiry']
+        with get_db_connection() as conn:
+            rows = conn.execute(
+                """
+                SELECT underlying, option_type, strike, strategy_type,
+                       premium_collected, quantity,
+                       COALESCE(CAST(julianday(expiry) - julianday(date('now', 'localtime')) AS INTEGER), 0)
+                           AS days_to_expiry
+                FROM positions WHERE status = 'OPEN' ORDER BY expiry ASC
+                """
+            ).fetchall()
+            if not rows:
+                return {col: [] for col in columns}
+            return {col: list(values) for col, values in zip(columns, zip(*rows))}
+
+    @staticmethod
+    def get_positions_version() -> tuple:
+        """
+        Get a cheap fingerprint of the positions table, for cache invalidation.
+
+        update_position writes a local-time updated_at while inserts use UTC
+        CURRENT_TIMESTAMP, so MAX(updated_at) alone can miss an edit. The open
+        count and the sum of all updated_at values change on every write.
+        """
+        with get_db_connection() as conn:
+            row = conn.execute(
+                """
+                SELECT COUNT(*), COALESCE(MAX(id), 0), COALESCE(SUM(status = 'OPEN'), 0),
+                       TOTAL(julianday(updated_at))
+                FROM positions
+                """
+            ).fetchone()
+            return tuple(row)
+
     @staticmethod
     def get_all_positions() -> List[Position]:
         """Get all positions."""
@@ -316,6 +360,20 @@ class DatabaseManager:
             )
             conn.commit()
 
+    @staticmethod
+    def remove_symbols_from_watchlist(watchlist_id: int, symbols: List[str]) -> None:
+        """Remove several symbols from a watchlist in one statement."""
+        if not symbols:
+            return
+
+        placeholders = ", ".join("?" for _ in symbols)
+        with get_db_connection() as conn:
+            conn.execute(
+                f"DELETE FROM watchlist_symbols WHERE watchlist_id = ? AND symbol IN ({placeholders})",
+                [watchlist_id] + [s.upper() for s in symbols]
+            )
+            conn.commit()
+
     @staticmethod
     def delete_watchlist(watchlist_id: int) -> None:
         """Delete a watchlist."""
@@ -335,6 +393,20 @@ class DatabaseManager:
             ).fetchone()
             return row['value'] if row else default
 
+    @staticmethod
+    def get_settings(keys: List[str]) -> Dict[str, str]:
+        """Get several setting values in one query. Missing keys are omitted."""
+        if not keys:
+            return {}
+
+        placeholders = ", ".join("?" for _ in keys)
+        with get_db_connection() as conn:
+            rows = conn.execute(
+                f"SELECT key, value FROM settings WHERE key IN ({placeholders})",
+                list(keys)
+            ).fetchall()
+            return {row['key']: row['value'] for row in rows}
+
     @staticmethod
     def set_setting(key: str, value: str) -> None:
         """Set a setting value."""
@@ -348,6 +420,41 @@ class DatabaseManager:
                 (key, value, value)
             )
             conn.commit()
+        DatabaseManager._settings_writes += 1
+
+    @staticmethod
+    def set_settings_bulk(pairs: Dict[str, str]) -> None:
+        """Set several setting values in a single transaction."""
+        if not pairs:
+            return
+
+        with get_db_connection() as conn:
+            conn.executemany(
+                """
+                INSERT INTO settings (key, value, updated_at)
+                VALUES (?, ?, CURRENT_TIMESTAMP)
+                ON CONFLICT(key) DO UPDATE SET value = ?, updated_at = CURRENT_TIMESTAMP
+                """,
+                [(key, value, value) for key, value in pairs.items()]
+            )
+            conn.commit()
+        DatabaseManager._settings_writes += 1
+
+    @staticmethod
+    def get_settings_version() -> tuple:
+        """
+        Get a cheap fingerprint of the settings table, for cache invalidation.
+
+        updated_at only has one-second resolution, so this process's write
+        counter is included to catch a key rewritten within the same second.
+        The sum over all rows catches writes from elsewhere to any key, not
+        just the newest one.
+        """
+        with get_db_connection() as conn:
+            row = conn.execute(
+                "SELECT COUNT(*), TOTAL(julianday(updated_at)) FROM settings"
+            ).fetchone()
+            return (*row, DatabaseManager._settings_writes)
 
     @staticmethod
     def get_all_settings() -> Dict[str, str]:
@@ -356,6 +463,50 @@ class DatabaseManager:
             rows = conn.execute("SELECT key, value FROM settings").fetchall()
             return {row['key']: row['value'] for row in rows}
 
+    # ==================== ASSISTANT CHAT ====================
+
+    @staticmethod
+    def append_chat_message(role: str, content: str) -> int:
+        """Append a message to the advisor chat history. Returns the message ID."""
+        with get_db_connection() as conn:
+            cursor = conn.execute(
+                "INSERT INTO assistant_chat (role, content) VALUES (?, ?)",
+                (role, content)
+            )
+            conn.commit()
+            return cursor.lastrowid
+
+    @staticmethod
+    def get_recent_chat_messages(limit: int = 50) -> List[Dict[str, Any]]:
+        """Get the most recent chat messages, oldest first."""
+        with get_db_connection() as conn:
+            rows = conn.execute(
+                "SELECT id, role, content FROM assistant_chat ORDER BY id DESC LIMIT ?",
+                (limit,)
+            ).fetchall()
+            return [dict(row) for row in reversed(rows)]
+
+    @staticmethod
+    def get_chat_messages_between(after_id: int, before_id: int) -> List[Dict[str, Any]]:
+        """Get chat messages with after_id < id < before_id, oldest first."""
+        with get_db_connection() as conn:
+            rows = conn.execute(
+                """
+                SELECT id, role, content FROM assistant_chat
+                WHERE id > ? AND id < ?
+                ORDER BY id ASC
+                """,
+                (after_id, before_id)
+            ).fetchall()
+            return [dict(row) for row in rows]
+
+    @staticmethod
+    def clear_chat_messages() -> None:
+        """Delete the advisor chat history."""
+        with get_db_connection() as conn:
+            conn.execute("DELETE FROM assistant_chat")
+            conn.commit()
+
     # ==================== PORTFOLIO METRICS ====================
 
     @staticmethod
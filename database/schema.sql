@@ -88,6 +88,14 @@ CREATE TABLE IF NOT EXISTS settings (
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
+-- Advisor chat history (append-only; the page loads only the recent tail)
+CREATE TABLE IF NOT EXISTS assistant_chat (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    role TEXT NOT NULL CHECK(role IN ('user', 'assistant')),
+    content TEXT NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
 -- Stock holdings (for covered call eligibility)
 CREATE TABLE IF NOT EXISTS stock_holdings (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
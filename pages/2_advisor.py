@@ -6,10 +6,15 @@ The central hub for finding opportunities and getting AI-powered suggestions.
 
 import streamlit as st
 import pandas as pd
+import numpy as np
 import plotly.graph_objects as go
 import re
 import json
+import html
+import time
+from collections import deque
 from datetime import date, datetime
+from typing import Optional, Sequence
 
 from database import DatabaseManager, init_database
 from core.black_scholes import BlackScholes
@@ -17,45 +22,138 @@ from config.constants import CALL, PUT
 from components.styles import apply_global_styles
 from utils.market_hours import is_market_open, get_market_status_display
 
+# Token counting for chat history budgeting
+try:
+    import tiktoken
+    TIKTOKEN_AVAILABLE = True
+except ImportError:
+    TIKTOKEN_AVAILABLE = False
+
 
 # ==================== AI CHAT HELPERS ====================
 
-def get_portfolio_context() -> str:
-    """Build context string about user's current positions and portfolio."""
-    positions = DatabaseManager.get_open_positions()
-    stats = DatabaseManager.get_position_stats()
+# Minimum seconds between chat re-renders while a reply is streaming
+STREAM_FLUSH_INTERVAL = 0.05
 
-    if not positions:
-        return "The user currently has no open positions."
+# Ticker-like words in a chat prompt, and common words that match but aren't tickers
+_SYMBOL_RE = re.compile(r'\b[A-Z]{1,5}\b')
+_STOPWORDS = frozenset({"I", "A", "THE", "FOR", "AT", "IS", "IT", "TO", "OF", "AND", "OR"})
+
+# Maximum tokens of recent chat history sent with each request
+HISTORY_TOKEN_BUDGET = 3000
 
-    lines = ["## Current Portfolio\n"]
+# Chat messages kept in session state; older turns stay in the database only
+CHAT_MEMORY_LIMIT = 50
+# Most recent messages rendered on each run; older ones in the tail are behind a toggle
+CHAT_VISIBLE_LIMIT = 20
 
-    total_premium = sum(p.premium_collected * p.quantity * 100 for p in positions)
-    lines.append(f"**Open Positions:** {len(positions)}")
-    lines.append(f"**Total Premium Collected:** ${total_premium:,.0f}")
-    lines.append(f"**Win Rate:** {stats.get('win_rate', 0):.0f}%\n")
 
-    lines.append("### Positions:\n")
+@st.cache_data(ttl=30, show_spinner=False)
+def get_portfolio_context(cache_key: tuple, connected: bool) -> str:
+    """
+    Build context string about user's current positions and portfolio.
 
-    for pos in positions:
-        dte = pos.days_to_expiry
-        urgency = ""
-        if dte <= 3:
-            urgency = " [CRITICAL - expiring soon!]"
-        elif dte <= 7:
-            urgency = " [Expiring this week]"
+    cache_key should change whenever the positions do (see
+    DatabaseManager.get_positions_version); the result is reused until then.
+    """
+    cols = DatabaseManager.get_open_positions_columnar()
+    stats = DatabaseManager.get_position_stats()
+
+    if not cols["underlying"]:
+        return "The user currently has no open positions."
 
-        lines.append(
-            f"- **{pos.underlying}** ${pos.strike:.0f} {pos.option_type} | "
-            f"{pos.strategy_type} | {dte}d to expiry | "
-            f"Premium: ${pos.premium_collected:.2f}/share | "
-            f"Qty: {pos.quantity}{urgency}"
+    premium = np.asarray(cols["premium_collected"], dtype=float)
+    quantity = np.asarray(cols["quantity"])
+    dte = np.asarray(cols["days_to_expiry"])
+
+    total_premium = float((premium * quantity).sum() * 100)
+    urgency = np.select(
+        [dte <= 3, dte <= 7],
+        [" [CRITICAL - expiring soon!]", " [Expiring this week]"],
+        default=""
+    )
+
+    header = (
+        "## Current Portfolio\n\n"
+        f"**Open Positions:** {len(dte)}\n"
+        f"**Total Premium Collected:** ${total_premium:,.0f}\n"
+        f"**Win Rate:** {stats.get('win_rate', 0):.0f}%\n\n"
+        "### Positions:\n\n"
+    )
+
+    body = "\n".join(
+        f"- **{underlying}** ${strike:.0f} {option_type} | "
+        f"{strategy} | {days}d to expiry | "
+        f"Premium: ${prem:.2f}/share | "
+        f"Qty: {qty}{flag}"
+        for underlying, strike, option_type, strategy, days, prem, qty, flag in zip(
+            cols["underlying"], cols["strike"], cols["option_type"], cols["strategy_type"],
+            cols["days_to_expiry"], cols["premium_collected"], cols["quantity"], urgency
         )
+    )
 
-    connected = st.session_state.get('ibkr_connected', False)
-    lines.append(f"\n**IBKR Status:** {'Connected' if connected else 'Not connected'}")
+    return f"{header}{body}\n\n**IBKR Status:** {'Connected' if connected else 'Not connected'}"
 
-    return "\n".join(lines)
+
+@st.cache_resource(show_spinner=False)
+def get_token_encoding(model: str):
+    """
+    Get the tiktoken encoding for a model, falling back to cl100k_base for non-OpenAI models.
+
+    Returns None if the encoding can't be loaded (tiktoken downloads it on first
+    use, which fails offline); the None is cached so the download isn't retried.
+    """
+    try:
+        try:
+            return tiktoken.encoding_for_model(model)
+        except KeyError:
+            return tiktoken.get_encoding("cl100k_base")
+    except Exception:
+        return None
+
+
+def count_tokens(text: str, model: str) -> int:
+    """Count tokens in text (roughly 4 characters per token without tiktoken)."""
+    encoding = get_token_encoding(model) if TIKTOKEN_AVAILABLE else None
+    if encoding is not None:
+        return len(encoding.encode(text))
+    return len(text) // 4 + 1
+
+
+def trim_history(history: Sequence, model: str, budget: int = HISTORY_TOKEN_BUDGET) -> list:
+    """
+    Get the most recent chat messages that fit within a token budget.
+
+    The latest message is always kept. The window never starts with an
+    assistant reply, since some providers require the first turn to be the user's.
+    """
+    kept = []
+    total = 0
+    for msg in reversed(history):
+        total += count_tokens(msg["content"], model)
+        if total > budget and kept:
+            break
+        kept.append(msg)
+    kept.reverse()
+
+    while len(kept) > 1 and kept[0]["role"] == "assistant":
+        kept.pop(0)
+
+    return kept
+
+
+def extract_symbols(prompt: str) -> list:
+    """
+    Find ticker candidates in a chat prompt.
+
+    Words the user typed in upper case are tried first; only if there are none
+    is the whole prompt upper-cased, so ordinary words don't each cost an IBKR
+    price request before the AI call can start.
+    """
+    symbols = [s for s in _SYMBOL_RE.findall(prompt) if s not in _STOPWORDS]
+    if not symbols:
+        symbols = [s for s in _SYMBOL_RE.findall(prompt.upper()) if s not in _STOPWORDS]
+    return symbols
 
 
 def get_live_price(symbol: str) -> str:
@@ -75,6 +173,17 @@ def get_live_price(symbol: str) -> str:
         return f"Error fetching price: {str(e)}"
 
 
+@st.cache_data(max_entries=1, show_spinner=False)
+def get_saved_settings(keys: tuple, settings_version: tuple) -> dict:
+    """Read several settings in one query, memoized until the settings table changes."""
+    return DatabaseManager.get_settings(list(keys))
+
+
+def portfolio_context_key() -> tuple:
+    """Cache key for get_portfolio_context: today's date plus the positions fingerprint."""
+    return (date.today(), DatabaseManager.get_positions_version())
+
+
 def get_ai_config() -> dict:
     """Get the current AI provider configuration."""
     PROVIDERS = {
@@ -82,48 +191,72 @@ def get_ai_config() -> dict:
             "name": "OpenAI",
             "key_setting": "openai_api_key",
             "base_url": None,
-            "default_model": "gpt-4o-mini"
+            "default_model": "gpt-4o-mini",
+            "summary_model": "gpt-4o-mini"
         },
         "deepseek": {
             "name": "DeepSeek",
             "key_setting": "deepseek_api_key",
             "base_url": "https://api.deepseek.com",
-            "default_model": "deepseek-chat"
+            "default_model": "deepseek-chat",
+            "summary_model": "deepseek-chat"
         },
         "anthropic": {
             "name": "Anthropic (Claude)",
             "key_setting": "anthropic_api_key",
             "base_url": "https://api.anthropic.com",
-            "default_model": "claude-3-5-sonnet-20241022"
+            "default_model": "claude-3-5-sonnet-20241022",
+            "summary_model": "claude-3-5-haiku-20241022"
         },
         "groq": {
             "name": "Groq",
             "key_setting": "groq_api_key",
             "base_url": "https://api.groq.com/openai/v1",
-            "default_model": "llama-3.3-70b-versatile"
+            "default_model": "llama-3.3-70b-versatile",
+            "summary_model": "llama-3.1-8b-instant"
         }
     }
 
-    provider = DatabaseManager.get_setting("ai_provider") or "openai"
+    # Every provider's key is fetched so the lookup is one query whichever is active
+    keys = ("ai_provider", "ai_model", "ai_system_prompt") + tuple(
+        p["key_setting"] for p in PROVIDERS.values()
+    )
+    saved = get_saved_settings(keys, DatabaseManager.get_settings_version())
+
+    provider = saved.get("ai_provider") or "openai"
     config = PROVIDERS.get(provider, PROVIDERS["openai"])
     config["provider"] = provider
-    config["api_key"] = DatabaseManager.get_setting(config["key_setting"])
-    config["model"] = DatabaseManager.get_setting("ai_model") or config["default_model"]
+    config["api_key"] = saved.get(config["key_setting"])
+    config["model"] = saved.get("ai_model") or config["default_model"]
+    config["system_prompt"] = saved.get("ai_system_prompt")
 
     return config
 
 
-def chat_with_ai(messages: list, config: dict) -> str:
-    """Send messages to the configured AI provider and get response."""
+@st.cache_resource(show_spinner=False)
+def get_ai_client(provider: str, api_key: str, base_url: Optional[str]):
+    """Get a reusable API client so HTTP connections are kept alive across messages."""
+    if provider == "anthropic":
+        import anthropic
+        return anthropic.Anthropic(api_key=api_key)
+
+    import openai
+
+    client_kwargs = {"api_key": api_key}
+    if base_url:
+        client_kwargs["base_url"] = base_url
+    return openai.OpenAI(**client_kwargs)
+
+
+def stream_ai_response(messages: list, config: dict, max_tokens: int = 1500):
+    """Stream a response from the configured AI provider, yielding text deltas."""
     provider = config["provider"]
     api_key = config["api_key"]
     model = config["model"]
 
-    if provider == "anthropic":
-        import anthropic
-
-        client = anthropic.Anthropic(api_key=api_key)
+    client = get_ai_client(provider, api_key, config["base_url"])
 
+    if provider == "anthropic":
         system_content = ""
         anthropic_messages = []
 
@@ -133,45 +266,243 @@ def chat_with_ai(messages: list, config: dict) -> str:
             else:
                 anthropic_messages.append({"role": msg["role"], "content": msg["content"]})
 
-        response = client.messages.create(
+        with client.messages.stream(
             model=model,
-            max_tokens=1500,
+            max_tokens=max_tokens,
             system=system_content,
             messages=anthropic_messages
-        )
-
-        return response.content[0].text
+        ) as stream:
+            for text in stream.text_stream:
+                yield text
 
     else:
-        import openai
-
-        client_kwargs = {"api_key": api_key}
-        if config["base_url"]:
-            client_kwargs["base_url"] = config["base_url"]
-
-        client = openai.OpenAI(**client_kwargs)
-
         is_reasoning_model = "o1" in model or "reasoner" in model
 
         if is_reasoning_model:
             response = client.chat.completions.create(
                 model=model,
                 messages=messages,
-                max_tokens=4096
+                max_tokens=4096,
+                stream=True
             )
         else:
             response = client.chat.completions.create(
                 model=model,
                 messages=messages,
                 temperature=0.7,
-                max_tokens=1500
+                max_tokens=max_tokens,
+                stream=True
             )
 
-        return response.choices[0].message.content
+        for chunk in response:
+            if chunk.choices:
+                yield chunk.choices[0].delta.content or ""
+
+
+def update_conversation_summary(window: list, config: dict) -> list:
+    """
+    Fold chat turns that have fallen out of the token window into a running summary.
+
+    Called with the window about to be sent, before the request, so no turn is
+    ever in neither the window nor the summary. The summary is kept in session
+    state along with the ID of the last summarized message, so each turn is only
+    summarized once, using the provider's cheaper summary model. Dropped turns are
+    read back from the database, since session state only holds the recent tail.
+
+    Returns the dropped turns if they could not be summarized, so the caller can
+    include them verbatim; otherwise an empty list.
+    """
+    if not window:
+        return []
+    cursor = st.session_state.get("assistant_summary_cursor", 0)
+    dropped = DatabaseManager.get_chat_messages_between(cursor, window[0]["id"])
+    if not dropped:
+        return []
+
+    transcript = "\n\n".join(
+        f"{msg['role'].title()}: {msg['content']}" for msg in dropped
+    )
+    previous = st.session_state.get("assistant_summary", "")
+    if previous:
+        transcript = f"Earlier summary:\n{previous}\n\nNew turns:\n{transcript}"
+
+    summary_messages = [
+        {"role": "system", "content": "Summarize the following conversation in 300 tokens or fewer. "
+                                      "Keep symbols, strikes, expiries and any decisions the user made."},
+        {"role": "user", "content": transcript}
+    ]
+    summary_config = {**config, "model": config["summary_model"]}
+
+    try:
+        summary = "".join(stream_ai_response(summary_messages, summary_config, max_tokens=400))
+    except Exception:
+        return dropped
+
+    st.session_state.assistant_summary = summary
+    st.session_state.assistant_summary_cursor = dropped[-1]["id"]
+    return []
+
+
+def load_chat_history() -> None:
+    """Load the recent chat tail from the database into session state, once per session."""
+    if "assistant_messages" in st.session_state:
+        return
+    history = DatabaseManager.get_recent_chat_messages(CHAT_MEMORY_LIMIT)
+    st.session_state.assistant_messages = deque(history, maxlen=CHAT_MEMORY_LIMIT)
+    # Turns from earlier sessions that were not loaded are not summarized
+    st.session_state.assistant_summary_cursor = history[0]["id"] - 1 if history else 0
+
+
+def record_chat_message(role: str, content: str) -> None:
+    """Persist a chat message and append it to the in-memory tail."""
+    msg_id = DatabaseManager.append_chat_message(role, content)
+    # Bounded deque: the oldest message is dropped in O(1) once the tail is full
+    st.session_state.assistant_messages.append({"id": msg_id, "role": role, "content": content})
+
+
+def conversation_summary_context(unsummarized: Optional[list] = None) -> str:
+    """Summary of earlier turns, plus any turns not yet summarized, to append to the system prompt."""
+    summary = st.session_state.get("assistant_summary", "")
+    if unsummarized:
+        turns = "\n\n".join(f"{msg['role'].title()}: {msg['content']}" for msg in unsummarized)
+        summary = f"{summary}\n\n{turns}" if summary else turns
+    if not summary:
+        return ""
+    return f"\n\n---\n\n## Conversation So Far\n{summary}"
+
+
+def stream_to_chat(messages: list, config: dict) -> str:
+    """
+    Stream an AI reply into an assistant chat bubble and return the full text.
+
+    If the request fails, the error is shown in the bubble and returned as the reply text.
+    """
+    with st.chat_message("assistant"):
+        placeholder = st.empty()
+        buffer = ""
+        last_flush = time.monotonic()
+        try:
+            for delta in stream_ai_response(messages, config):
+                buffer += delta
+                now = time.monotonic()
+                if now - last_flush >= STREAM_FLUSH_INTERVAL:
+                    # Plain preformatted text while streaming; markdown is parsed once at the end
+                    placeholder.markdown(
+                        f"<pre style='white-space: pre-wrap; font-family: inherit;'>{html.escape(buffer)}</pre>",
+                        unsafe_allow_html=True
+                    )
+                    last_flush = now
+        except Exception as e:
+            error = f"Error: {str(e)}"
+            placeholder.error(error)
+            return error
+        placeholder.markdown(buffer)
+    return buffer
 
 
 # ==================== TAB: AI CHAT ====================
 
+def process_user_message(prompt: str, chat_container, ai_config: dict,
+                         system_prompt: str, connected: bool, lookup_prices: bool = True) -> None:
+    """
+    Send a user message to the AI and stream the reply into the chat container.
+
+    Both messages are recorded and shown in place, so no rerun is needed afterwards.
+    lookup_prices=False skips the live-price lookup (used for the canned quick
+    questions, which mention "current" but name no ticker).
+    """
+    record_chat_message("user", prompt)
+
+    portfolio_context = get_portfolio_context(portfolio_context_key(), connected)
+
+    price_info = ""
+    if lookup_prices and connected and any(word in prompt.lower() for word in ["price", "current", "quote", "trading at"]):
+        for sym in extract_symbols(prompt):
+            price_result = get_live_price(sym)
+            if "Current price" in price_result:
+                price_info = f"\n\n**Live Data:** {price_result}"
+                break
+
+    # Fold turns the new message pushes out of the window before sending, not after
+    window = trim_history(st.session_state.assistant_messages, ai_config["model"])
+    unsummarized = update_conversation_summary(window, ai_config)
+
+    full_system = (
+        f"{system_prompt}\n\n---\n\n{portfolio_context}{price_info}"
+        f"{conversation_summary_context(unsummarized)}"
+    )
+
+    messages = [{"role": "system", "content": full_system}]
+    messages.extend({"role": msg["role"], "content": msg["content"]} for msg in window)
+
+    with chat_container:
+        with st.chat_message("user"):
+            st.markdown(prompt)
+        response = stream_to_chat(messages, ai_config)
+    record_chat_message("assistant", response)
+
+
+@st.fragment
+def render_chat_panel(ai_config: dict, system_prompt: str, connected: bool):
+    """
+    Render chat history, quick questions and the chat input.
+
+    Runs as a fragment so a chat turn only re-executes this panel, not the
+    page header, positions sidebar or the other tabs.
+    """
+    # Load chat history
+    load_chat_history()
+
+    # Chat container with fixed height for scrolling
+    chat_container = st.container(height=350)
+
+    with chat_container:
+        history = list(st.session_state.assistant_messages)
+        earlier, visible = history[:-CHAT_VISIBLE_LIMIT], history[-CHAT_VISIBLE_LIMIT:]
+        # Earlier messages are only rendered on request (an expander would still render them)
+        if earlier and st.toggle("Show earlier messages", key="chat_show_earlier"):
+            for message in earlier:
+                with st.chat_message(message["role"]):
+                    st.markdown(message["content"])
+        for message in visible:
+            with st.chat_message(message["role"]):
+                st.markdown(message["content"])
+
+    # Quick question buttons
+    question = None
+    lookup_prices = False
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        if st.button("Portfolio", use_container_width=True, help="Analyze my portfolio"):
+            question = "Analyze my current portfolio. How am I doing? Any concerns?"
+    with col2:
+        if st.button("Rolls", use_container_width=True, help="Roll suggestions"):
+            question = "What roll opportunities do you see for my current positions?"
+    with col3:
+        if st.button("Attention", use_container_width=True, help="Positions needing attention"):
+            question = "Which of my positions need attention right now? Any expiring soon or at risk?"
+    with col4:
+        if st.button("Ideas", use_container_width=True, help="New trade ideas"):
+            question = "Based on my portfolio, what new trades would you suggest to generate premium?"
+
+    # Chat input
+    if prompt := st.chat_input("Ask about positions, strategies, or get suggestions..."):
+        question = prompt
+        lookup_prices = True
+
+    if question:
+        process_user_message(question, chat_container, ai_config, system_prompt, connected, lookup_prices)
+
+    # Clear chat button
+    if st.session_state.assistant_messages:
+        if st.button("Clear Chat", use_container_width=True):
+            DatabaseManager.clear_chat_messages()
+            st.session_state.assistant_messages.clear()
+            st.session_state.assistant_summary = ""
+            st.session_state.assistant_summary_cursor = 0
+            st.rerun()
+
+
 def render_chat_tab():
     """Render the AI chat interface."""
     ai_config = get_ai_config()
@@ -208,102 +539,13 @@ Key behaviors:
 
 You have access to the user's current portfolio data which will be provided with each message."""
 
-        system_prompt = DatabaseManager.get_setting("ai_system_prompt") or default_system_prompt
+        system_prompt = ai_config["system_prompt"] or default_system_prompt
         connected = st.session_state.get('ibkr_connected', False)
 
         # Status bar
         st.caption(f"{provider_name}: {model}")
 
-        # Initialize chat history
-        if "assistant_messages" not in st.session_state:
-            st.session_state.assistant_messages = []
-
-        # Chat container with fixed height for scrolling
-        chat_container = st.container(height=350)
-
-        with chat_container:
-            for message in st.session_state.assistant_messages:
-                with st.chat_message(message["role"]):
-                    st.markdown(message["content"])
-
-        # Quick question buttons
-        col1, col2, col3, col4 = st.columns(4)
-        with col1:
-            if st.button("Portfolio", use_container_width=True, help="Analyze my portfolio"):
-                st.session_state.pending_question = "Analyze my current portfolio. How am I doing? Any concerns?"
-                st.rerun()
-        with col2:
-            if st.button("Rolls", use_container_width=True, help="Roll suggestions"):
-                st.session_state.pending_question = "What roll opportunities do you see for my current positions?"
-                st.rerun()
-        with col3:
-            if st.button("Attention", use_container_width=True, help="Positions needing attention"):
-                st.session_state.pending_question = "Which of my positions need attention right now? Any expiring soon or at risk?"
-                st.rerun()
-        with col4:
-            if st.button("Ideas", use_container_width=True, help="New trade ideas"):
-                st.session_state.pending_question = "Based on my portfolio, what new trades would you suggest to generate premium?"
-                st.rerun()
-
-        # Chat input
-        if prompt := st.chat_input("Ask about positions, strategies, or get suggestions..."):
-            st.session_state.assistant_messages.append({"role": "user", "content": prompt})
-
-            portfolio_context = get_portfolio_context()
-
-            price_info = ""
-            if connected and any(word in prompt.lower() for word in ["price", "current", "quote", "trading at"]):
-                symbols = re.findall(r'\b[A-Z]{1,5}\b', prompt.upper())
-                for sym in symbols:
-                    if sym not in ["I", "A", "THE", "FOR", "AT", "IS", "IT", "TO", "OF", "AND", "OR"]:
-                        price_result = get_live_price(sym)
-                        if "Current price" in price_result:
-                            price_info = f"\n\n**Live Data:** {price_result}"
-                            break
-
-            full_system = f"{system_prompt}\n\n---\n\n{portfolio_context}{price_info}"
-
-            messages = [{"role": "system", "content": full_system}]
-            for msg in st.session_state.assistant_messages[-10:]:
-                messages.append({"role": msg["role"], "content": msg["content"]})
-
-            spinner_text = "Reasoning..." if "reasoner" in model or "o1" in model else "Thinking..."
-            with st.spinner(spinner_text):
-                try:
-                    response = chat_with_ai(messages, ai_config)
-                    st.session_state.assistant_messages.append({"role": "assistant", "content": response})
-                except Exception as e:
-                    st.session_state.assistant_messages.append({"role": "assistant", "content": f"Error: {str(e)}"})
-
-            st.rerun()
-
-        # Handle pending questions
-        if "pending_question" in st.session_state:
-            question = st.session_state.pending_question
-            del st.session_state.pending_question
-
-            st.session_state.assistant_messages.append({"role": "user", "content": question})
-
-            portfolio_context = get_portfolio_context()
-            full_system = f"{system_prompt}\n\n---\n\n{portfolio_context}"
-
-            messages = [{"role": "system", "content": full_system}]
-            for msg in st.session_state.assistant_messages[-10:]:
-                messages.append({"role": msg["role"], "content": msg["content"]})
-
-            try:
-                response = chat_with_ai(messages, ai_config)
-                st.session_state.assistant_messages.append({"role": "assistant", "content": response})
-            except Exception as e:
-                st.session_state.assistant_messages.append({"role": "assistant", "content": f"Error: {str(e)}"})
-
-            st.rerun()
-
-        # Clear chat button
-        if st.session_state.assistant_messages:
-            if st.button("Clear Chat", use_container_width=True):
-                st.session_state.assistant_messages = []
-                st.rerun()
+        render_chat_panel(ai_config, system_prompt, connected)
 
     with col_context:
         st.markdown("#### Your Positions")
@@ -8,7 +8,58 @@ from datetime import datetime
 from database import DatabaseManager, init_database
 from config.settings import get_settings, Settings, IBKRSettings
 from data.ibkr_client import get_ibkr_client
-from components.styles import apply_global_styles
+from components.styles import apply_global_styles, symbol_chip
+
+# IBKR market data type labels
+_MDT_LABELS = {1: "Live", 2: "Frozen", 3: "Delayed", 4: "Delayed Frozen"}
+
+
+@st.cache_resource
+def _db():
+    """Database manager, with the schema initialized once per process."""
+    init_database()
+    return DatabaseManager
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _cached_watchlists():
+    """Watchlists with their symbols, cached across reruns until modified."""
+    return _db().get_all_watchlists()
+
+
+@st.cache_resource
+def _cached_settings() -> Settings:
+    """
+    Application settings, shared across reruns and sessions.
+
+    get_settings() already returns a process-wide Settings loaded from
+    the environment and defaults, not from the settings table, so Saves
+    here do not change it.
+    """
+    return get_settings()
+
+
+@st.cache_resource
+def _ibkr():
+    """IBKR client, managed by Streamlit as a process-wide resource."""
+    return get_ibkr_client()
+
+
+@st.cache_data(ttl=2, show_spinner=False)
+def _cached_status(client_id):
+    """IBKR connection status, cached briefly per active client ID."""
+    return _ibkr().get_status()
+
+
+def _save_changed_settings(new_values: dict) -> bool:
+    """Persist only the settings that differ from what is stored. Returns True if anything was written."""
+    stored = DatabaseManager.get_all_settings()
+    changed = {k: v for k, v in new_values.items() if stored.get(k) != v}
+    if not changed:
+        return False
+
+    DatabaseManager.set_settings_bulk(changed)
+    return True
 
 
 def render_settings():
@@ -24,9 +75,9 @@ def render_settings():
     </div>
     """, unsafe_allow_html=True)
 
-    # Initialize
-    init_database()
-    settings = get_settings()
+    # Initialize (once per process)
+    _db()
+    settings = _cached_settings()
 
     # Tabs
     tab1, tab2, tab3, tab4, tab5, tab6 = st.tabs(["IBKR", "AI Assistant", "Watchlists", "Scanner", "Alerts", "Profile"])
@@ -50,6 +101,7 @@ def render_settings():
         render_profile_settings()
 
 
+@st.fragment
 def render_ai_settings():
     """Render AI Assistant settings - multi-provider API key and model configuration."""
 
@@ -115,22 +167,22 @@ def render_ai_settings():
 
     if has_key:
         masked_key = saved_key[:8] + "..." + saved_key[-4:] if len(saved_key) > 12 else "***"
-        st.markdown(f"""
-        <div class="ob-banner-success">
-            <strong>{provider_config['name']} Configured</strong>
-            <span class="text-muted" style="margin-left: 12px;">Key: {masked_key}</span>
-        </div>
-        """, unsafe_allow_html=True)
+        banner_html = (
+            f'<div class="ob-banner-success"><strong>{provider_config["name"]} Configured</strong> '
+            f'<span class="text-muted" style="margin-left: 12px;">Key: {masked_key}</span></div>'
+        )
     else:
-        st.markdown(f"""
-        <div class="ob-banner-warning">
-            <strong>{provider_config['name']} - API Key Required</strong>
-            <span class="text-muted" style="margin-left: 12px;">Add your API key below</span>
-        </div>
-        """, unsafe_allow_html=True)
+        banner_html = (
+            f'<div class="ob-banner-warning"><strong>{provider_config["name"]} - API Key Required</strong> '
+            '<span class="text-muted" style="margin-left: 12px;">Add your API key below</span></div>'
+        )
 
-    # Provider selection
-    st.markdown("#### AI Provider")
+    # Banner and provider selection header, sent as one message
+    st.markdown(f"""
+    {banner_html}
+
+    #### AI Provider
+    """, unsafe_allow_html=True)
 
     provider_names = list(PROVIDERS.keys())
     provider_display = {k: v["name"] for k, v in PROVIDERS.items()}
@@ -309,121 +361,122 @@ Key behaviors:
         """)
 
 
+@st.fragment
 def render_ibkr_settings(settings: Settings):
     """Render IBKR connection settings."""
     connected = st.session_state.get('ibkr_connected', False)
     active_client_id = st.session_state.get('ibkr_active_client_id', None)
 
-    # Connection status banner
+    # Connection status banner and section header, sent as one message
     if connected:
         connection_time = st.session_state.get('ibkr_connection_time', '')
         client_id_display = f" | Client ID: {active_client_id}" if active_client_id else ""
-        st.markdown(f"""
-        <div class="ob-banner-success">
-            <strong>Connected to IBKR</strong>
-            <span class="text-muted" style="margin-left: 12px;">Since: {connection_time}{client_id_display}</span>
-        </div>
-        """, unsafe_allow_html=True)
+        banner_html = (
+            '<div class="ob-banner-success"><strong>Connected to IBKR</strong> '
+            f'<span class="text-muted" style="margin-left: 12px;">Since: {connection_time}{client_id_display}</span></div>'
+        )
     else:
-        st.markdown("""
-        <div class="ob-banner-error">
-            <strong>Not Connected</strong>
-            <span class="text-muted" style="margin-left: 12px;">Configure and connect below</span>
-        </div>
-        """, unsafe_allow_html=True)
+        banner_html = (
+            '<div class="ob-banner-error"><strong>Not Connected</strong> '
+            '<span class="text-muted" style="margin-left: 12px;">Configure and connect below</span></div>'
+        )
 
-    # Connection settings - compact
-    st.markdown("#### Connection Settings")
+    st.markdown(f"""
+    {banner_html}
 
-    col1, col2, col3, col4 = st.columns(4)
+    #### Connection Settings
+    """, unsafe_allow_html=True)
+    ibkr = settings.ibkr
 
-    with col1:
-        host = st.text_input("Host", value=settings.ibkr.host, help="Usually 127.0.0.1")
+    with st.form("ibkr_connection_form", border=False):
+        col1, col2, col3, col4 = st.columns(4)
 
-    with col2:
-        port = st.number_input("Port", value=settings.ibkr.port, min_value=1000, max_value=65535,
-                                help="7497=paper, 7496=live")
+        with col1:
+            host = st.text_input("Host", value=ibkr.host, help="Usually 127.0.0.1")
 
-    with col3:
-        client_id = st.number_input("Client ID", value=settings.ibkr.client_id, min_value=1, max_value=999,
-                                     help="Will use random ID if conflict detected")
-
-    with col4:
-        market_data_type = st.selectbox(
-            "Data Type",
-            options=[1, 2, 3, 4],
-            index=settings.ibkr.market_data_type - 1,
-            format_func=lambda x: {1: "Live", 2: "Frozen", 3: "Delayed", 4: "Delayed Frozen"}[x]
-        )
+        with col2:
+            port = st.number_input("Port", value=ibkr.port, min_value=1000, max_value=65535,
+                                    help="7497=paper, 7496=live")
 
-    # Connection buttons - now with 4 columns
-    col1, col2, col3, col4 = st.columns(4)
+        with col3:
+            client_id = st.number_input("Client ID", value=ibkr.client_id, min_value=1, max_value=999,
+                                         help="Will use random ID if conflict detected")
+
+        with col4:
+            market_data_type = st.selectbox(
+                "Data Type",
+                options=list(_MDT_LABELS),
+                index=ibkr.market_data_type - 1,
+                format_func=_MDT_LABELS.__getitem__
+            )
 
-    with col1:
-        if st.button("Connect", use_container_width=True, disabled=connected, type="primary"):
-            with st.spinner("Connecting..."):
-                try:
-                    client = get_ibkr_client()
-                    client.settings = IBKRSettings(
-                        host=host, port=port, client_id=client_id, market_data_type=market_data_type
-                    )
-                    status = client.connect()
+        # Connection buttons - now with 4 columns
+        col1, col2, col3, col4 = st.columns(4)
 
-                    if status.is_connected:
-                        st.session_state.ibkr_connected = True
-                        st.session_state.ibkr_connection_time = datetime.now().strftime("%H:%M:%S")
-                        st.session_state.ibkr_active_client_id = client._active_client_id
-                        st.rerun()
-                    else:
-                        st.error(f"Failed: {status.error_message}")
+        with col1:
+            if st.form_submit_button("Connect", use_container_width=True, disabled=connected, type="primary"):
+                with st.spinner("Connecting..."):
+                    try:
+                        client = _ibkr()
+                        client.settings = IBKRSettings(
+                            host=host, port=port, client_id=client_id, market_data_type=market_data_type
+                        )
+                        status = client.connect()
+
+                        if status.is_connected:
+                            st.session_state.ibkr_connected = True
+                            st.session_state.ibkr_connection_time = datetime.now().strftime("%H:%M:%S")
+                            st.session_state.ibkr_active_client_id = client._active_client_id
+                            st.rerun()
+                        else:
+                            st.error(f"Failed: {status.error_message}")
+                    except Exception as e:
+                        st.error(f"Error: {str(e)}")
+
+        with col2:
+            if st.form_submit_button("Disconnect", use_container_width=True, disabled=not connected):
+                try:
+                    client = _ibkr()
+                    client.disconnect()
+                    st.session_state.ibkr_connected = False
+                    st.session_state.ibkr_connection_time = None
+                    st.session_state.ibkr_active_client_id = None
+                    st.rerun()
                 except Exception as e:
                     st.error(f"Error: {str(e)}")
 
-    with col2:
-        if st.button("Disconnect", use_container_width=True, disabled=not connected):
-            try:
-                client = get_ibkr_client()
-                client.disconnect()
-                st.session_state.ibkr_connected = False
-                st.session_state.ibkr_connection_time = None
-                st.session_state.ibkr_active_client_id = None
-                st.rerun()
-            except Exception as e:
-                st.error(f"Error: {str(e)}")
+        with col3:
+            if st.form_submit_button("Force Reconnect", use_container_width=True,
+                                     help="Use when connection is stuck after app reload"):
+                with st.spinner("Reconnecting..."):
+                    try:
+                        client = _ibkr()
+                        client.settings = IBKRSettings(
+                            host=host, port=port, client_id=client_id, market_data_type=market_data_type
+                        )
+                        status = client.force_reconnect()
+
+                        if status.is_connected:
+                            st.session_state.ibkr_connected = True
+                            st.session_state.ibkr_connection_time = datetime.now().strftime("%H:%M:%S")
+                            st.session_state.ibkr_active_client_id = client._active_client_id
+                            st.success(f"Reconnected with client ID {client._active_client_id}")
+                            st.rerun()
+                        else:
+                            st.error(f"Failed: {status.error_message}")
+                    except Exception as e:
+                        st.error(f"Error: {str(e)}")
 
-    with col3:
-        if st.button("Force Reconnect", use_container_width=True,
-                     help="Use when connection is stuck after app reload"):
-            with st.spinner("Reconnecting..."):
+        with col4:
+            if st.form_submit_button("Test", use_container_width=True):
                 try:
-                    client = get_ibkr_client()
-                    client.settings = IBKRSettings(
-                        host=host, port=port, client_id=client_id, market_data_type=market_data_type
-                    )
-                    status = client.force_reconnect()
-
+                    status = _cached_status(active_client_id)
                     if status.is_connected:
-                        st.session_state.ibkr_connected = True
-                        st.session_state.ibkr_connection_time = datetime.now().strftime("%H:%M:%S")
-                        st.session_state.ibkr_active_client_id = client._active_client_id
-                        st.success(f"Reconnected with client ID {client._active_client_id}")
-                        st.rerun()
+                        st.success(f"OK! Server v{status.server_version}")
                     else:
-                        st.error(f"Failed: {status.error_message}")
+                        st.warning("Not connected")
                 except Exception as e:
-                    st.error(f"Error: {str(e)}")
-
-    with col4:
-        if st.button("Test", use_container_width=True):
-            try:
-                client = get_ibkr_client()
-                status = client.get_status()
-                if status.is_connected:
-                    st.success(f"OK! Server v{status.server_version}")
-                else:
-                    st.warning("Not connected")
-            except Exception as e:
-                st.error(f"Failed: {str(e)}")
+                    st.error(f"Failed: {str(e)}")
 
     # Sync Portfolio section - only show when connected
     if connected:
@@ -432,7 +485,7 @@ def render_ibkr_settings(settings: Settings):
         st.caption("Import your stocks and options positions from IBKR")
 
         # Account selector
-        client = get_ibkr_client()
+        client = _ibkr()
         accounts = client.get_managed_accounts()
 
         if accounts:
@@ -580,9 +633,10 @@ def render_ibkr_settings(settings: Settings):
         """)
 
 
+@st.fragment
 def render_watchlist_settings():
     """Render watchlist management."""
-    watchlists = DatabaseManager.get_all_watchlists()
+    watchlists = _cached_watchlists()
 
     # Create new - compact
     col1, col2, col3 = st.columns([2, 2, 1])
@@ -595,6 +649,7 @@ def render_watchlist_settings():
             if new_name:
                 try:
                     DatabaseManager.create_watchlist(new_name, new_desc)
+                    _cached_watchlists.clear()
                     st.rerun()
                 except Exception as e:
                     st.error(f"Error: {e}")
@@ -608,121 +663,141 @@ def render_watchlist_settings():
 
             # Show symbols as chips
             if wl.symbols:
-                chips_html = " ".join([
-                    f'<span class="ob-chip">{s}</span>'
-                    for s in wl.symbols
-                ])
+                chips_html = " ".join(symbol_chip(s) for s in wl.symbols)
                 st.markdown(f'<div style="margin-bottom: 8px;">{chips_html}</div>', unsafe_allow_html=True)
             else:
                 st.caption("No symbols")
 
-            # Add symbol
-            col1, col2 = st.columns([3, 1])
-            with col1:
-                new_symbol = st.text_input("Add", key=f"add_{wl.id}", placeholder="AAPL",
-                                            label_visibility="collapsed").upper()
-            with col2:
-                if st.button("Add", key=f"add_btn_{wl.id}", use_container_width=True):
-                    if new_symbol:
-                        DatabaseManager.add_symbol_to_watchlist(wl.id, new_symbol)
-                        st.rerun()
+            # Add symbol - in a form so typing doesn't rerun the page
+            with st.form(f"wl_{wl.id}", border=False):
+                col1, col2 = st.columns([3, 1])
+                with col1:
+                    new_symbol = st.text_input("Add", key=f"add_{wl.id}", placeholder="AAPL",
+                                                label_visibility="collapsed").upper()
+                with col2:
+                    if st.form_submit_button("Add", use_container_width=True):
+                        if new_symbol:
+                            DatabaseManager.add_symbol_to_watchlist(wl.id, new_symbol)
+                            _cached_watchlists.clear()
+                            st.rerun()
 
             # Remove symbols
             if wl.symbols:
                 to_remove = st.multiselect("Remove", wl.symbols, key=f"remove_{wl.id}",
                                             label_visibility="collapsed")
                 if to_remove and st.button("Remove Selected", key=f"remove_btn_{wl.id}"):
-                    for sym in to_remove:
-                        DatabaseManager.remove_symbol_from_watchlist(wl.id, sym)
+                    DatabaseManager.remove_symbols_from_watchlist(wl.id, to_remove)
+                    _cached_watchlists.clear()
                     st.rerun()
 
             # Delete
             if wl.name != "Default":
                 if st.button("Delete Watchlist", key=f"delete_{wl.id}"):
                     DatabaseManager.delete_watchlist(wl.id)
+                    _cached_watchlists.clear()
                     st.rerun()
 
 
+@st.fragment
 def render_scanner_defaults(settings: Settings):
     """Render scanner default settings."""
     st.caption("Pre-selected when you open Scanner")
+    scanner = settings.scanner
 
-    col1, col2 = st.columns(2)
+    with st.form("scanner_defaults_form", border=False):
+        col1, col2 = st.columns(2)
 
-    with col1:
-        st.markdown("**DTE Range**")
-        min_dte = st.number_input("Min DTE", value=settings.scanner.min_dte, min_value=1, max_value=365)
-        max_dte = st.number_input("Max DTE", value=settings.scanner.max_dte, min_value=1, max_value=365)
+        with col1:
+            st.markdown("**DTE Range**")
+            min_dte = st.number_input("Min DTE", value=scanner.min_dte, min_value=1, max_value=365)
+            max_dte = st.number_input("Max DTE", value=scanner.max_dte, min_value=1, max_value=365)
 
-        st.markdown("**Delta Range**")
-        min_delta = st.number_input("Min Delta", value=settings.scanner.min_delta,
-                                     min_value=0.05, max_value=0.50, step=0.05)
-        max_delta = st.number_input("Max Delta", value=settings.scanner.max_delta,
-                                     min_value=0.05, max_value=0.50, step=0.05)
+            st.markdown("**Delta Range**")
+            min_delta = st.number_input("Min Delta", value=scanner.min_delta,
+                                         min_value=0.05, max_value=0.50, step=0.05)
+            max_delta = st.number_input("Max Delta", value=scanner.max_delta,
+                                         min_value=0.05, max_value=0.50, step=0.05)
 
-    with col2:
-        st.markdown("**Premium & Volatility**")
-        min_premium = st.number_input("Min Premium ($)", value=settings.scanner.min_premium,
-                                       min_value=0.01, step=0.25)
-        iv_hv_threshold = st.number_input("IV/HV Threshold", value=settings.scanner.iv_hv_threshold,
-                                           min_value=1.0, max_value=3.0, step=0.1)
-
-        st.markdown("**Strategies**")
-        strategies = st.multiselect("Default", ["CSP", "CC", "BULL_PUT", "BEAR_CALL"],
-                                     default=settings.scanner.strategies)
-
-    if st.button("Save Scanner Defaults", use_container_width=True, type="primary"):
-        DatabaseManager.set_setting("scanner_min_dte", str(min_dte))
-        DatabaseManager.set_setting("scanner_max_dte", str(max_dte))
-        DatabaseManager.set_setting("scanner_min_delta", str(min_delta))
-        DatabaseManager.set_setting("scanner_max_delta", str(max_delta))
-        DatabaseManager.set_setting("scanner_min_premium", str(min_premium))
-        DatabaseManager.set_setting("scanner_iv_hv_threshold", str(iv_hv_threshold))
-        DatabaseManager.set_setting("scanner_strategies", ",".join(strategies))
-        st.success("Saved!")
+        with col2:
+            st.markdown("**Premium & Volatility**")
+            min_premium = st.number_input("Min Premium ($)", value=scanner.min_premium,
+                                           min_value=0.01, step=0.25)
+            iv_hv_threshold = st.number_input("IV/HV Threshold", value=scanner.iv_hv_threshold,
+                                               min_value=1.0, max_value=3.0, step=0.1)
+
+            st.markdown("**Strategies**")
+            strategies = st.multiselect("Default", ["CSP", "CC", "BULL_PUT", "BEAR_CALL"],
+                                         default=scanner.strategies)
+
+        if st.form_submit_button("Save Scanner Defaults", use_container_width=True, type="primary"):
+            saved = _save_changed_settings({
+                "scanner_min_dte": str(min_dte),
+                "scanner_max_dte": str(max_dte),
+                "scanner_min_delta": str(min_delta),
+                "scanner_max_delta": str(max_delta),
+                "scanner_min_premium": str(min_premium),
+                "scanner_iv_hv_threshold": str(iv_hv_threshold),
+                "scanner_strategies": ",".join(strategies),
+            })
+            if saved:
+                st.success("Saved!")
+            else:
+                st.info("No changes to save")
 
 
+@st.fragment
 def render_alert_settings(settings: Settings):
     """Render alert configuration."""
     st.caption("Configure position alerts")
+    alerts = settings.alerts
 
-    col1, col2 = st.columns(2)
+    with st.form("alert_settings_form", border=False):
+        col1, col2 = st.columns(2)
 
-    with col1:
-        st.markdown("**Expiry Alerts**")
-        expiry_warning = st.number_input("Days before expiry", value=settings.alerts.days_to_expiry_warning,
-                                          min_value=1, max_value=30)
+        with col1:
+            st.markdown("**Expiry Alerts**")
+            expiry_warning = st.number_input("Days before expiry", value=alerts.days_to_expiry_warning,
+                                              min_value=1, max_value=30)
 
-        st.markdown("**Delta Alerts**")
-        delta_warning = st.number_input("Alert when delta >", value=settings.alerts.delta_warning_threshold,
-                                         min_value=0.30, max_value=0.95, step=0.05)
+            st.markdown("**Delta Alerts**")
+            delta_warning = st.number_input("Alert when delta >", value=alerts.delta_warning_threshold,
+                                             min_value=0.30, max_value=0.95, step=0.05)
 
-    with col2:
-        st.markdown("**Profit/Loss Targets**")
-        profit_target = st.number_input("Profit target (%)", value=settings.alerts.profit_target_percent,
-                                         min_value=10.0, max_value=100.0, step=5.0)
-        loss_limit = st.number_input("Loss limit (%)", value=settings.alerts.loss_limit_percent,
-                                      min_value=50.0, max_value=500.0, step=25.0)
-
-    if st.button("Save Alert Settings", use_container_width=True, type="primary"):
-        DatabaseManager.set_setting("alert_expiry_warning", str(expiry_warning))
-        DatabaseManager.set_setting("alert_delta_warning", str(delta_warning))
-        DatabaseManager.set_setting("alert_profit_target", str(profit_target))
-        DatabaseManager.set_setting("alert_loss_limit", str(loss_limit))
-        st.success("Saved!")
+        with col2:
+            st.markdown("**Profit/Loss Targets**")
+            profit_target = st.number_input("Profit target (%)", value=alerts.profit_target_percent,
+                                             min_value=10.0, max_value=100.0, step=5.0)
+            loss_limit = st.number_input("Loss limit (%)", value=alerts.loss_limit_percent,
+                                          min_value=50.0, max_value=500.0, step=25.0)
+
+        if st.form_submit_button("Save Alert Settings", use_container_width=True, type="primary"):
+            saved = _save_changed_settings({
+                "alert_expiry_warning": str(expiry_warning),
+                "alert_delta_warning": str(delta_warning),
+                "alert_profit_target": str(profit_target),
+                "alert_loss_limit": str(loss_limit),
+            })
+            if saved:
+                st.success("Saved!")
+            else:
+                st.info("No changes to save")
 
     # Risk-free rate
     st.markdown("---")
     st.markdown("**Calculation Settings**")
 
-    risk_free = st.number_input("Risk-Free Rate (%)", value=settings.risk_free_rate * 100,
-                                 min_value=0.0, max_value=20.0, step=0.25)
+    with st.form("calculation_settings_form", border=False):
+        risk_free = st.number_input("Risk-Free Rate (%)", value=settings.risk_free_rate * 100,
+                                     min_value=0.0, max_value=20.0, step=0.25)
 
-    if st.button("Save Calculation Settings"):
-        DatabaseManager.set_setting("risk_free_rate", str(risk_free / 100))
-        st.success("Saved!")
+        if st.form_submit_button("Save Calculation Settings"):
+            if _save_changed_settings({"risk_free_rate": str(risk_free / 100)}):
+                st.success("Saved!")
+            else:
+                st.info("No changes to save")
 
 
+@st.fragment
 def render_profile_settings():
     """Render profile export/import settings."""
     import json
@@ -733,7 +808,7 @@ def render_profile_settings():
 
     # Current profile info
     all_settings = DatabaseManager.get_all_settings()
-    watchlists = DatabaseManager.get_all_watchlists()
+    watchlists = _cached_watchlists()
 
     # Count of saved items
     col1, col2, col3 = st.columns(3)
@@ -896,6 +971,7 @@ def render_profile_settings():
                                     DatabaseManager.add_symbol_to_watchlist(wl_id, symbol)
                                 imported_count += 1
 
+                _cached_watchlists.clear()
                 st.success(f"Imported {imported_count} items successfully!")
                 st.rerun()
 
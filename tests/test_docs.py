@@ -22,6 +22,26 @@ import pytest
 PROJECT_ROOT = Path(__file__).parent.parent
 DOCS_DIR = PROJECT_ROOT / "docs"
 
+# Changelog version headings, e.g. [1.0.0] and [1.0.0] - 2024-12-28
+_VERSION_RE = re.compile(r'\[[\d]+\.[\d]+\.[\d]+\]')
+_DATE_RE = re.compile(r'\[[\d]+\.[\d]+\.[\d]+\] - \d{4}-\d{2}-\d{2}')
+
+# Allow "Todo" as a status but not "TODO:" or "TODO -" as placeholders
+_PLACEHOLDER_RE = re.compile(r'TODO:|TODO -|FIXME:|XXX:')
+
+
+@pytest.fixture(scope="session")
+def all_docs():
+    """Contents of the main docs, read once per test session."""
+    docs = {}
+    for filename in ["README.md", "docs/PRD.md", "docs/CHANGELOG.md", "docs/TASKS.md"]:
+        filepath = PROJECT_ROOT / filename
+        if filepath.exists():
+            docs[filename] = filepath.read_text()
+        else:
+            docs[filename] = ""
+    return docs
+
 
 class TestDocumentationExists:
     """Test that all required documentation files exist."""
@@ -172,9 +192,7 @@ class TestChangelogStructure:
 
     def test_changelog_has_version_entries(self, changelog_content):
         """CHANGELOG must have at least one version entry."""
-        # Look for version pattern like [1.0.0] - 2024-12-28
-        version_pattern = r'\[[\d]+\.[\d]+\.[\d]+\]'
-        matches = re.findall(version_pattern, changelog_content)
+        matches = _VERSION_RE.findall(changelog_content)
         assert len(matches) >= 1, "CHANGELOG must have at least one version entry"
 
     def test_changelog_has_added_section(self, changelog_content):
@@ -183,9 +201,7 @@ class TestChangelogStructure:
 
     def test_changelog_versions_are_dated(self, changelog_content):
         """CHANGELOG versions should have dates."""
-        # Pattern: [x.x.x] - YYYY-MM-DD
-        date_pattern = r'\[[\d]+\.[\d]+\.[\d]+\] - \d{4}-\d{2}-\d{2}'
-        matches = re.findall(date_pattern, changelog_content)
+        matches = _DATE_RE.findall(changelog_content)
         assert len(matches) >= 1, "CHANGELOG versions must have dates in YYYY-MM-DD format"
 
 
@@ -241,17 +257,6 @@ class TestTasksStructure:
 class TestDocumentationConsistency:
     """Test that documentation is consistent across files."""
 
-    @pytest.fixture
-    def all_docs(self):
-        docs = {}
-        for filename in ["README.md", "docs/PRD.md", "docs/CHANGELOG.md", "docs/TASKS.md"]:
-            filepath = PROJECT_ROOT / filename
-            if filepath.exists():
-                docs[filename] = filepath.read_text()
-            else:
-                docs[filename] = ""
-        return docs
-
     def test_version_consistency(self, all_docs):
         """Version numbers should be consistent across docs."""
         # Extract version from README
@@ -322,17 +327,6 @@ class TestCodebaseDocumentationSync:
 class TestDocumentationQuality:
     """Test documentation quality metrics."""
 
-    @pytest.fixture
-    def all_docs(self):
-        docs = {}
-        for filename in ["README.md", "docs/PRD.md", "docs/CHANGELOG.md", "docs/TASKS.md"]:
-            filepath = PROJECT_ROOT / filename
-            if filepath.exists():
-                docs[filename] = filepath.read_text()
-            else:
-                docs[filename] = ""
-        return docs
-
     def test_readme_minimum_length(self, all_docs):
         """README should have substantial content."""
         readme = all_docs.get("README.md", "")
@@ -356,10 +350,8 @@ class TestDocumentationQuality:
     def test_no_todo_placeholders(self, all_docs):
         """Docs should not have TODO placeholders."""
         for filename, content in all_docs.items():
-            # Allow "Todo" as a status but not "TODO:" or "TODO -" as placeholders
-            placeholder_patterns = ["TODO:", "TODO -", "FIXME:", "XXX:"]
-            for pattern in placeholder_patterns:
-                assert pattern not in content, f"{filename} contains placeholder '{pattern}'"
+            match = _PLACEHOLDER_RE.search(content)
+            assert match is None, f"{filename} contains placeholder '{match.group(0)}'"
 
     def test_no_broken_links(self, all_docs):
         """Check for obviously broken internal links."""
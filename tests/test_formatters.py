@@ -0,0 +1,77 @@
+"""
+Formatter Tests for Options Buddy
+
+Checks indicator bands and the vectorized formatters against their
+per-value counterparts.
+
+Run with: pytest tests/test_formatters.py -v
+"""
+
+import pytest
+
+from utils.formatters import (
+    format_currency,
+    format_currency_series,
+    format_iv_hv_ratio,
+    format_score,
+    format_score_series
+)
+
+
+CURRENCY_VALUES = [0.0, 1.5, -1.5, 1234567.891, -0.0, float("nan"), -1e-9, 0.004, -0.004]
+
+
+class TestFormatCurrencySeries:
+    """format_currency_series must match format_currency element for element."""
+
+    @pytest.fixture(autouse=True)
+    def _require_pandas(self):
+        pytest.importorskip("pandas")
+
+    @pytest.mark.parametrize("include_sign", [False, True])
+    def test_matches_scalar(self, include_sign):
+        """Signs, -0.0 and NaN format the same as the scalar version."""
+        result = list(format_currency_series(CURRENCY_VALUES, include_sign))
+        expected = [format_currency(v, include_sign) for v in CURRENCY_VALUES]
+        assert result == expected
+
+    def test_keeps_index(self):
+        """The result is aligned with the input Series."""
+        import pandas as pd
+
+        values = pd.Series([10.0, -2.0], index=["a", "b"])
+        result = format_currency_series(values)
+        assert list(result.index) == ["a", "b"]
+        assert list(result) == ["$10.00", "-$2.00"]
+
+
+class TestIndicatorBands:
+    """Score and IV/HV indicators by band, including NaN."""
+
+    @pytest.mark.parametrize("score,expected", [
+        (0, "0"),
+        (39.4, "39"),
+        (40, "40 ⚡"),
+        (60, "60 ✅"),
+        (80, "80 \U0001F31F"),
+        (float("nan"), "nan"),
+    ])
+    def test_format_score(self, score, expected):
+        assert format_score(score) == expected
+
+    @pytest.mark.parametrize("ratio,expected", [
+        (None, "N/A"),
+        (0.5, "0.50 ⬇️"),
+        (1.0, "1.00"),
+        (1.2, "1.20 ⬆️"),
+        (1.5, "1.50 \U0001F525"),
+        (float("nan"), "nan ⬇️"),
+    ])
+    def test_format_iv_hv_ratio(self, ratio, expected):
+        assert format_iv_hv_ratio(ratio) == expected
+
+    def test_format_score_series_matches_scalar(self):
+        """The vectorized version gives the same bands, and NaN gets no indicator."""
+        pytest.importorskip("pandas")
+        scores = [0, 39.4, 40, 59.9, 60, 80, 99, float("nan")]
+        assert list(format_score_series(scores)) == [format_score(s) for s in scores]
@@ -0,0 +1,156 @@
+"""
+Market Hours Tests for Options Buddy
+
+Covers weekends, listed and fallback holidays, session boundaries and the
+next-open calculation, all on a fixed Eastern clock.
+
+Run with: pytest tests/test_market_hours.py -v
+"""
+
+from datetime import date, datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+
+import utils.market_hours as mh
+
+
+EASTERN = mh._EASTERN
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Set the Eastern wall clock seen by market_hours; returns a setter."""
+    def set_clock(*args):
+        now = datetime(*args, tzinfo=EASTERN)
+        monkeypatch.setattr(mh, "get_eastern_time", lambda: now)
+        # is_market_open caches per real minute; start each check from a clean cache
+        mh._STATUS_CACHE.clear()
+        return now
+    return set_clock
+
+
+class TestWeekends:
+    """Saturdays and Sundays are closed."""
+
+    @pytest.mark.parametrize("day,name", [(18, "Saturday"), (19, "Sunday")])
+    def test_weekend_closed(self, clock, day, name):
+        clock(2025, 1, day, 12, 0)
+        assert mh.is_market_open() == (False, f"Market closed - {name}. Opens Monday 9:30 AM ET.")
+
+    def test_is_weekend(self):
+        assert mh.is_weekend(datetime(2025, 1, 18, tzinfo=EASTERN))
+        assert not mh.is_weekend(datetime(2025, 1, 17, tzinfo=EASTERN))
+
+
+class TestHolidays:
+    """Listed holidays for 2024-2025 and the fallback set for other years."""
+
+    @pytest.mark.parametrize("day", [
+        date(2024, 1, 15),   # MLK Day
+        date(2024, 3, 29),   # Good Friday
+        date(2024, 11, 28),  # Thanksgiving
+        date(2025, 4, 18),   # Good Friday
+        date(2025, 6, 19),   # Juneteenth
+        date(2025, 12, 25),  # Christmas
+    ])
+    def test_listed_holidays(self, clock, day):
+        assert mh.is_market_holiday(day)
+        clock(day.year, day.month, day.day, 12, 0)
+        assert mh.is_market_open() == (False, "Market closed - US market holiday.")
+
+    def test_listed_years_only_use_their_own_dates(self):
+        # MLK Day 2024 was Jan 15; in 2025 that date is a normal Wednesday
+        assert not mh.is_market_holiday(date(2025, 1, 15))
+
+    @pytest.mark.parametrize("day", [
+        date(2026, 1, 1),
+        date(2026, 7, 4),
+        date(2028, 7, 4),    # leap year: day-of-year shifts by one
+        date(2028, 12, 25),
+    ])
+    def test_fallback_holidays(self, day):
+        assert mh.is_market_holiday(day)
+
+    @pytest.mark.parametrize("day", [
+        date(2026, 1, 19),   # MLK Day 2026 is not in the fallback set
+        date(2028, 7, 3),
+        date(2028, 12, 26),
+    ])
+    def test_fallback_non_holidays(self, day):
+        assert not mh.is_market_holiday(day)
+
+    def test_fallback_holiday_on_weekday_is_closed(self, clock):
+        clock(2026, 1, 1, 11, 0)
+        assert mh.is_market_open() == (False, "Market closed - US market holiday.")
+
+    def test_fallback_year_normal_day_is_open(self, clock):
+        clock(2026, 1, 19, 11, 0)
+        assert mh.is_market_open()[0]
+
+
+class TestSessionBoundaries:
+    """Open at 9:30, closed from 16:00, with minute-accurate messages."""
+
+    @pytest.mark.parametrize("hour,minute,expected", [
+        (0, 0, (False, "Market opens in 9h 30m (9:30 AM ET).")),
+        (9, 29, (False, "Market opens in 0h 1m (9:30 AM ET).")),
+        (9, 30, (True, "Market open - 6h 30m until close (4:00 PM ET).")),
+        (15, 59, (True, "Market open - 0h 1m until close (4:00 PM ET).")),
+        (16, 0, (False, "Market closed for today. Opens tomorrow 9:30 AM ET.")),
+        (23, 59, (False, "Market closed for today. Opens tomorrow 9:30 AM ET.")),
+    ])
+    def test_boundaries(self, clock, hour, minute, expected):
+        clock(2025, 1, 21, hour, minute)
+        assert mh.is_market_open() == expected
+
+    def test_seconds_do_not_matter(self, clock):
+        clock(2025, 1, 21, 9, 29, 59)
+        assert not mh.is_market_open()[0]
+        clock(2025, 1, 21, 15, 59, 59)
+        assert mh.is_market_open()[0]
+
+    def test_status_display(self, clock):
+        clock(2025, 1, 21, 10, 0)
+        display = mh.get_market_status_display()
+        assert display["is_open"] and display["banner_class"] == "ob-banner-success"
+        assert display["message"] == "Market open - 6h 0m until close (4:00 PM ET)."
+        clock(2025, 1, 18, 10, 0)
+        display = mh.get_market_status_display()
+        assert not display["is_open"] and display["banner_class"] == "ob-banner-warning"
+
+
+class TestNextMarketOpen:
+    """get_next_market_open skips weekends and holidays."""
+
+    @pytest.mark.parametrize("now,expected", [
+        ((2025, 1, 21, 8, 0), "Today at 9:30 AM ET"),
+        ((2025, 1, 21, 10, 0), "Open now"),
+        ((2025, 1, 16, 17, 0), "Tomorrow at 9:30 AM ET"),
+        ((2025, 1, 17, 17, 0), "Tuesday, Jan 21 at 9:30 AM ET"),    # MLK Monday
+        ((2025, 1, 18, 8, 0), "Tuesday, Jan 21 at 9:30 AM ET"),
+        ((2025, 4, 17, 17, 0), "Monday, Apr 21 at 9:30 AM ET"),     # Good Friday
+        ((2025, 11, 27, 10, 0), "Tomorrow at 9:30 AM ET"),         # Thanksgiving
+        ((2024, 12, 24, 17, 0), "Thursday, Dec 26 at 9:30 AM ET"),  # Christmas
+        ((2025, 12, 31, 17, 0), "Friday, Jan 2 at 9:30 AM ET"),     # into a fallback year
+    ])
+    def test_next_open(self, clock, now, expected):
+        clock(*now)
+        assert mh.get_next_market_open() == expected
+
+
+class TestEasternMinute:
+    """The cached UTC offset follows DST transitions."""
+
+    @pytest.mark.parametrize("start", [
+        datetime(2025, 3, 9, 5, 0, tzinfo=timezone.utc),   # spring forward
+        datetime(2025, 11, 2, 4, 0, tzinfo=timezone.utc),  # fall back
+    ])
+    def test_matches_zoneinfo_across_dst(self, monkeypatch, start):
+        monkeypatch.setattr(mh, "_OFFSET_CACHE", {})
+        for step in range(0, 4 * 3600, 59):
+            ts = start.timestamp() + step
+            monkeypatch.setattr(mh, "time", SimpleNamespace(time=lambda ts=ts: ts))
+            local = datetime.fromtimestamp(ts, EASTERN)
+            expected = int((ts + local.utcoffset().total_seconds()) // 60)
+            assert mh._eastern_minute() == expected
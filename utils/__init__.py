@@ -1,6 +1,12 @@
 """Utility functions for Options Buddy."""
 
-from .formatters import format_currency, format_percentage, format_date
+from .formatters import (
+    format_currency,
+    format_currency_series,
+    format_percentage,
+    format_date,
+    format_score_series
+)
 from .market_hours import (
     is_market_open,
     get_market_status_display,
@@ -1,5 +1,6 @@
 """Formatting utilities."""
 
+from bisect import bisect_right
 from datetime import date, datetime
 from typing import Union, Optional
 
@@ -13,6 +14,27 @@ def format_currency(value: float, include_sign: bool = False) -> str:
     return f"${value:,.2f}"
 
 
+def format_currency_series(values, include_sign: bool = False):
+    """
+    Format a numeric column as currency (vectorized format_currency).
+
+    Gives the same string as format_currency for every element, including
+    NaN and -0.0. numpy/pandas are imported here so importing utils stays light.
+    """
+    import numpy as np
+    import pandas as pd
+
+    values = pd.Series(values)
+    amounts = values.to_numpy(dtype=float)
+    negative = amounts < 0
+    if include_sign:
+        sign = np.where(negative, "-$", np.where(amounts >= 0, "+$", "$"))
+    else:
+        sign = np.where(negative, "-$", "$")
+    magnitude = pd.Series(np.where(negative, -amounts, amounts), index=values.index).map("{:,.2f}".format)
+    return pd.Series(sign, index=values.index, dtype=object) + magnitude
+
+
 def format_percentage(value: float, decimals: int = 1) -> str:
     """Format a decimal as percentage."""
     return f"{value * 100:.{decimals}f}%"
@@ -22,9 +44,7 @@ def format_date(d: Union[date, datetime, str], fmt: str = "%Y-%m-%d") -> str:
     """Format a date."""
     if isinstance(d, str):
         return d
-    if isinstance(d, datetime):
-        return d.strftime(fmt)
-    if isinstance(d, date):
+    if isinstance(d, date):  # also covers datetime
         return d.strftime(fmt)
     return str(d)
 
@@ -44,27 +64,47 @@ def format_dte(dte: int) -> str:
         return f"{dte} days"
 
 
+# Indicator emoji, spelled as escapes so they survive any source re-encoding.
+_FIRE = "\U0001F525"
+_UP = "\u2B06\uFE0F"
+_DOWN = "\u2B07\uFE0F"
+_STAR = "\U0001F31F"
+_CHECK = "\u2705"
+_BOLT = "\u26A1"
+
+# Lower bounds for each indicator band; suffix i applies when the value
+# is at or above threshold i-1 (bisect_right / searchsorted side="right").
+_IV_HV_THRESHOLDS = (1.0, 1.2, 1.5)
+_IV_HV_SUFFIX = (f" {_DOWN}", "", f" {_UP}", f" {_FIRE}")
+
+_SCORE_THRESHOLDS = (40, 60, 80)
+_SCORE_SUFFIX = ("", f" {_BOLT}", f" {_CHECK}", f" {_STAR}")
+
+
 def format_iv_hv_ratio(ratio: Optional[float]) -> str:
     """Format IV/HV ratio with indicator."""
     if ratio is None:
         return "N/A"
-    if ratio >= 1.5:
-        return f"{ratio:.2f} 🔥"
-    elif ratio >= 1.2:
-        return f"{ratio:.2f} ⬆️"
-    elif ratio >= 1.0:
-        return f"{ratio:.2f}"
-    else:
-        return f"{ratio:.2f} ⬇️"
+    if ratio != ratio:  # NaN sorts above every threshold; keep it in the lowest band
+        return f"{ratio:.2f}{_IV_HV_SUFFIX[0]}"
+    return f"{ratio:.2f}{_IV_HV_SUFFIX[bisect_right(_IV_HV_THRESHOLDS, ratio)]}"
 
 
 def format_score(score: float) -> str:
     """Format opportunity score."""
-    if score >= 80:
-        return f"{score:.0f} 🌟"
-    elif score >= 60:
-        return f"{score:.0f} ✅"
-    elif score >= 40:
-        return f"{score:.0f} ⚡"
-    else:
+    if score != score:  # NaN gets no indicator
         return f"{score:.0f}"
+    return f"{score:.0f}{_SCORE_SUFFIX[bisect_right(_SCORE_THRESHOLDS, score)]}"
+
+
+def format_score_series(scores):
+    """Format a column of opportunity scores (vectorized format_score)."""
+    import numpy as np
+    import pandas as pd
+
+    scores = pd.Series(scores)
+    values = scores.to_numpy(dtype=float)
+    bands = np.searchsorted(_SCORE_THRESHOLDS, values, side="right")
+    bands[np.isnan(values)] = 0  # searchsorted puts NaN in the top band
+    suffix = pd.Series(np.asarray(_SCORE_SUFFIX, dtype=object)[bands], index=scores.index)
+    return scores.map("{:.0f}".format) + suffix
@@ -1,8 +1,8 @@
 """Market hours utilities for US options markets."""
 
-from datetime import datetime, time
-from typing import Tuple, Optional
-import logging
+import time
+from datetime import date, datetime, timedelta
+from typing import Tuple, Optional, Union
 
 try:
     from zoneinfo import ZoneInfo
@@ -17,11 +17,12 @@ from config.constants import (
     MARKET_TIMEZONE
 )
 
-logger = logging.getLogger(__name__)
+# Built once; ZoneInfo construction reads tzdata and is the costly part of "now"
+_EASTERN = ZoneInfo(MARKET_TIMEZONE)
 
 # US Market Holidays 2024-2025 (dates when market is closed)
 # Format: (month, day)
-US_MARKET_HOLIDAYS_2024 = [
+US_MARKET_HOLIDAYS_2024 = frozenset({
     (1, 1),    # New Year's Day
     (1, 15),   # MLK Day
     (2, 19),   # Presidents Day
@@ -32,9 +33,9 @@ US_MARKET_HOLIDAYS_2024 = [
     (9, 2),    # Labor Day
     (11, 28),  # Thanksgiving
     (12, 25),  # Christmas
-]
+})
 
-US_MARKET_HOLIDAYS_2025 = [
+US_MARKET_HOLIDAYS_2025 = frozenset({
     (1, 1),    # New Year's Day
     (1, 20),   # MLK Day
     (2, 17),   # Presidents Day
@@ -45,30 +46,128 @@ US_MARKET_HOLIDAYS_2025 = [
     (9, 1),    # Labor Day
     (11, 27),  # Thanksgiving
     (12, 25),  # Christmas
-]
+})
 
+_HOLIDAYS_BY_YEAR = {
+    2024: US_MARKET_HOLIDAYS_2024,
+    2025: US_MARKET_HOLIDAYS_2025,
+}
 
-def get_eastern_time() -> datetime:
-    """Get current time in US Eastern timezone."""
-    eastern = ZoneInfo(MARKET_TIMEZONE)
-    return datetime.now(eastern)
+# For other years, just check common holidays
+_FALLBACK_HOLIDAYS = frozenset({(1, 1), (12, 25), (7, 4)})
 
 
-def is_market_holiday(dt: Optional[datetime] = None) -> bool:
+def _build_holiday_bitmap(year: int, holidays: frozenset) -> int:
+    """Pack a year's holidays into an int with bit N set for day-of-year N."""
+    bitmap = 0
+    for month, day in holidays:
+        bitmap |= 1 << date(year, month, day).timetuple().tm_yday
+    return bitmap
+
+
+_HOLIDAY_BITMAP_BY_YEAR = {
+    year: _build_holiday_bitmap(year, holidays)
+    for year, holidays in _HOLIDAYS_BY_YEAR.items()
+}
+
+
+def _holiday_bitmap(year: int) -> int:
+    """Holiday bitmap for a year, built from the fallback holidays on first use."""
+    bitmap = _HOLIDAY_BITMAP_BY_YEAR.get(year)
+    if bitmap is None:
+        bitmap = _build_holiday_bitmap(year, _FALLBACK_HOLIDAYS)
+        _HOLIDAY_BITMAP_BY_YEAR[year] = bitmap
+    return bitmap
+
+
+_TRADING_DAY_BITMAP_BY_YEAR = {}
+
+
+def _trading_day_bitmap(year: int) -> int:
+    """Bitmap with bit N set when day-of-year N is a weekday and not a holiday."""
+    bitmap = _TRADING_DAY_BITMAP_BY_YEAR.get(year)
+    if bitmap is None:
+        holidays = _holiday_bitmap(year)
+        day = date(year, 1, 1)
+        bitmap = 0
+        for doy in range(1, date(year, 12, 31).timetuple().tm_yday + 1):
+            if day.weekday() < 5 and not (holidays >> doy) & 1:
+                bitmap |= 1 << doy
+            day += timedelta(days=1)
+        _TRADING_DAY_BITMAP_BY_YEAR[year] = bitmap
+    return bitmap
+
+
+# Regular session bounds, in minutes since midnight
+_OPEN_MOD = MARKET_OPEN_HOUR * 60 + MARKET_OPEN_MINUTE
+_CLOSE_MOD = MARKET_CLOSE_HOUR * 60 + MARKET_CLOSE_MINUTE
+
+# Status messages indexed by minutes until open / until close
+_PRE_OPEN_MSG = tuple(
+    f"Market opens in {m // 60}h {m % 60}m (9:30 AM ET)." for m in range(_OPEN_MOD + 1)
+)
+_DURING_OPEN_MSG = tuple(
+    f"Market open - {m // 60}h {m % 60}m until close (4:00 PM ET)."
+    for m in range(_CLOSE_MOD - _OPEN_MOD + 1)
+)
+
+_WEEKDAY_NAMES = ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")
+
+# Fixed fields of get_market_status_display; only "message" varies
+_OPEN_TEMPLATE = {
+    "is_open": True,
+    "css_class": "text-profit",
+    "icon": "🟢",
+    "banner_class": "ob-banner-success"
+}
+_CLOSED_TEMPLATE = {
+    "is_open": False,
+    "css_class": "text-warning",
+    "icon": "🔴",
+    "banner_class": "ob-banner-warning"
+}
+
+# Last is_market_open result, keyed by Eastern wall-clock minute (see _eastern_minute)
+_STATUS_CACHE = {}
+
+# Eastern UTC offset and the timestamp it is valid until. US DST changes
+# happen on the hour, so an offset is good until the next UTC hour.
+_OFFSET_CACHE = {}
+
+
+def get_eastern_time(_tz=_EASTERN, _now=datetime.now) -> datetime:
+    """
+    Get current time in US Eastern timezone.
+
+    The timezone and datetime.now are bound as defaults so the call does
+    no global lookups; callers should not pass them.
+    """
+    return _now(_tz)
+
+
+def _decompose(dt: datetime) -> Tuple[int, int, int, int]:
+    """Split a datetime into (year, day_of_year, weekday, minute_of_day) with one timetuple() call."""
+    tt = dt.timetuple()
+    return tt.tm_year, tt.tm_yday, tt.tm_wday, tt.tm_hour * 60 + tt.tm_min
+
+
+def _eastern_minute() -> int:
+    """Current Eastern wall-clock time as whole minutes since the epoch, without building a datetime."""
+    ts = time.time()
+    offset, valid_until = _OFFSET_CACHE.get("current", (0.0, 0.0))
+    if ts >= valid_until:
+        offset = datetime.fromtimestamp(ts, _EASTERN).utcoffset().total_seconds()
+        valid_until = (ts // 3600 + 1) * 3600
+        _OFFSET_CACHE["current"] = (offset, valid_until)
+    return int((ts + offset) // 60)
+
+
+def is_market_holiday(dt: Optional[Union[date, datetime]] = None) -> bool:
     """Check if the given date is a US market holiday."""
     if dt is None:
         dt = get_eastern_time()
 
-    month_day = (dt.month, dt.day)
-    year = dt.year
-
-    if year == 2024:
-        return month_day in US_MARKET_HOLIDAYS_2024
-    elif year == 2025:
-        return month_day in US_MARKET_HOLIDAYS_2025
-
-    # For other years, just check common holidays
-    return month_day in [(1, 1), (12, 25), (7, 4)]
+    return bool((_holiday_bitmap(dt.year) >> dt.timetuple().tm_yday) & 1)
 
 
 def is_weekend(dt: Optional[datetime] = None) -> bool:
@@ -82,45 +181,41 @@ def is_market_open() -> Tuple[bool, str]:
     """
     Check if the US options market is currently open.
 
+    The result only changes once a minute, so it is reused for the rest of
+    the current minute.
+
     Returns:
         Tuple of (is_open: bool, status_message: str)
     """
-    now = get_eastern_time()
+    key = _eastern_minute()
 
-    # Check weekend
-    if is_weekend(now):
-        day_name = "Saturday" if now.weekday() == 5 else "Sunday"
-        return False, f"Market closed - {day_name}. Opens Monday 9:30 AM ET."
+    cached = _STATUS_CACHE.get(key)
+    if cached is None:
+        cached = _market_status(get_eastern_time())
+        _STATUS_CACHE.clear()
+        _STATUS_CACHE[key] = cached
+    return cached
 
-    # Check holiday
-    if is_market_holiday(now):
+
+def _market_status(now: datetime) -> Tuple[bool, str]:
+    """Compute market open status and message for the given Eastern time."""
+    year, doy, wd, current_mod = _decompose(now)
+
+    # One bit test covers both the weekend and the holiday check on trading days
+    if not (_trading_day_bitmap(year) >> doy) & 1:
+        if wd >= 5:
+            return False, f"Market closed - {_WEEKDAY_NAMES[wd]}. Opens Monday 9:30 AM ET."
         return False, "Market closed - US market holiday."
 
     # Check time
-    market_open = time(MARKET_OPEN_HOUR, MARKET_OPEN_MINUTE)
-    market_close = time(MARKET_CLOSE_HOUR, MARKET_CLOSE_MINUTE)
-    current_time = now.time()
-
-    if current_time < market_open:
-        minutes_until = (
-            (MARKET_OPEN_HOUR * 60 + MARKET_OPEN_MINUTE) -
-            (current_time.hour * 60 + current_time.minute)
-        )
-        hours = minutes_until // 60
-        mins = minutes_until % 60
-        return False, f"Market opens in {hours}h {mins}m (9:30 AM ET)."
-
-    if current_time >= market_close:
+    if current_mod < _OPEN_MOD:
+        return False, _PRE_OPEN_MSG[_OPEN_MOD - current_mod]
+
+    if current_mod >= _CLOSE_MOD:
         return False, "Market closed for today. Opens tomorrow 9:30 AM ET."
 
     # Market is open
-    minutes_remaining = (
-        (MARKET_CLOSE_HOUR * 60 + MARKET_CLOSE_MINUTE) -
-        (current_time.hour * 60 + current_time.minute)
-    )
-    hours = minutes_remaining // 60
-    mins = minutes_remaining % 60
-    return True, f"Market open - {hours}h {mins}m until close (4:00 PM ET)."
+    return True, _DURING_OPEN_MSG[_CLOSE_MOD - current_mod]
 
 
 def get_market_status_display() -> dict:
@@ -132,43 +227,27 @@ def get_market_status_display() -> dict:
     """
     is_open, message = is_market_open()
 
-    if is_open:
-        return {
-            "is_open": True,
-            "message": message,
-            "css_class": "text-profit",
-            "icon": "🟢",
-            "banner_class": "ob-banner-success"
-        }
-    else:
-        return {
-            "is_open": False,
-            "message": message,
-            "css_class": "text-warning",
-            "icon": "🔴",
-            "banner_class": "ob-banner-warning"
-        }
+    result = _OPEN_TEMPLATE.copy() if is_open else _CLOSED_TEMPLATE.copy()
+    result["message"] = message
+    return result
 
 
 def get_next_market_open() -> str:
     """Get a human-readable string for when the market next opens."""
     now = get_eastern_time()
-
-    # If it's a weekday and before close, market opens today or is open
-    if now.weekday() < 5:
-        if now.time() < time(MARKET_CLOSE_HOUR, MARKET_CLOSE_MINUTE):
-            if now.time() < time(MARKET_OPEN_HOUR, MARKET_OPEN_MINUTE):
-                return "Today at 9:30 AM ET"
-            else:
-                return "Open now"
-
-    # Find next trading day
-    days_ahead = 1
-    if now.weekday() == 4:  # Friday after close
-        days_ahead = 3
-    elif now.weekday() == 5:  # Saturday
-        days_ahead = 2
-    elif now.weekday() == 6:  # Sunday
-        days_ahead = 1
-
-    return f"Next trading day at 9:30 AM ET"
+    year, doy, wd, mod = _decompose(now)
+
+    # If it's a trading day and before close, market opens today or is open
+    if mod < _CLOSE_MOD and (_trading_day_bitmap(year) >> doy) & 1:
+        if mod < _OPEN_MOD:
+            return "Today at 9:30 AM ET"
+        return "Open now"
+
+    # Find next trading day, skipping weekends and holidays
+    candidate = now.date() + timedelta(days=1)
+    while candidate.weekday() >= 5 or is_market_holiday(candidate):
+        candidate += timedelta(days=1)
+
+    if candidate - now.date() == timedelta(days=1):
+        return "Tomorrow at 9:30 AM ET"
+    return f"{_WEEKDAY_NAMES[candidate.weekday()]}, {candidate:%b} {candidate.day} at 9:30 AM ET"